@@ -0,0 +1,221 @@
+"""
+The bots module defines scripted players for the Turtle's Adventure game and
+a harness running many bot episodes as fast as the game engine allows.
+"""
+from typing import Callable, Final, NamedTuple
+import argparse
+import math
+import random
+import time
+import tkinter as tk
+from turtle_adventure import TurtleAdventureGame, Enemy, FencingEnemy, PlayerPolicy
+
+SCREEN_WIDTH: Final = 800
+SCREEN_HEIGHT: Final = 500
+
+
+def all_enemies(game: TurtleAdventureGame) -> list[Enemy]:
+    """
+    Give every enemy currently in the game
+    """
+    return game.enemies + game.fencing_enemies + game.boss_enemies + game.bullets
+
+
+class GreedyHomePolicy(PlayerPolicy):
+    """
+    Walk straight home, ignoring every enemy
+    """
+
+    def choose_waypoint(self, game: TurtleAdventureGame) -> tuple[float, float] | None:
+        return game.home.x, game.home.y
+
+
+class PotentialFieldPolicy(PlayerPolicy):
+    """
+    Follow the sum of a pull towards home and pushes away from the enemies
+    within radius of the player
+    """
+
+    def __init__(self, radius: float = 120, repulsion: float = 2000, reach: float = 30):
+        self.radius: float = radius
+        self.repulsion: float = repulsion
+        self.reach: float = reach
+
+    def choose_waypoint(self, game: TurtleAdventureGame) -> tuple[float, float] | None:
+        px, py = game.player.x, game.player.y
+        dx, dy = game.home.x - px, game.home.y - py
+        distance = math.hypot(dx, dy) or 1
+        fx, fy = dx / distance, dy / distance
+        for enemy in all_enemies(game):
+            ex, ey = px - enemy.x, py - enemy.y
+            d2 = ex*ex + ey*ey
+            if 0 < d2 < self.radius**2:
+                # push falls with the square of the distance
+                fx += self.repulsion * ex / d2 / math.sqrt(d2)
+                fy += self.repulsion * ey / d2 / math.sqrt(d2)
+        norm = math.hypot(fx, fy) or 1
+        return px + self.reach * fx / norm, py + self.reach * fy / norm
+
+
+class LookaheadPolicy(PlayerPolicy):
+    """
+    Try a number of headings, predict where the player and the enemies will
+    be over the next frames, and take the heading that keeps the most
+    clearance while getting closer to home
+    """
+
+    def __init__(self, samples: int = 12, horizon: int = 10, radius: float = 150):
+        self.samples: int = samples
+        self.horizon: int = horizon
+        self.radius: float = radius
+
+    def predict(self,
+                enemy: Enemy,
+                path: list[tuple[float, float]]) -> list[tuple[float, float]]:
+        """
+        Predict an enemy's positions while the player walks along path.
+        Fencing enemies know their own future; the others are assumed to
+        walk towards the player.
+        """
+        if isinstance(enemy, FencingEnemy):
+            return enemy.predict(len(path))
+        x, y = enemy.x, enemy.y
+        positions = []
+        for px, py in path:
+            distance = math.hypot(px - x, py - y) or 1
+            x += enemy.speed * (px - x) / distance
+            y += enemy.speed * (py - y) / distance
+            positions.append((x, y))
+        return positions
+
+    def choose_waypoint(self, game: TurtleAdventureGame) -> tuple[float, float] | None:
+        player, home = game.player, game.home
+        near = [e for e in all_enemies(game)
+                if math.hypot(e.x - player.x, e.y - player.y) < self.radius]
+        best, best_score = None, -math.inf
+        offset = random.random() * 2 * math.pi / self.samples
+        for i in range(self.samples):
+            angle = offset + 2 * math.pi * i / self.samples
+            step_x = player.speed * math.cos(angle)
+            step_y = player.speed * math.sin(angle)
+            path = [(player.x + step_x*k, player.y + step_y*k)
+                    for k in range(1, self.horizon + 1)]
+            clearance = self.radius
+            for enemy in near:
+                for (px, py), (ex, ey) in zip(path, self.predict(enemy, path)):
+                    clearance = min(clearance, math.hypot(px - ex, py - ey) - enemy.size)
+            end_x, end_y = path[-1]
+            score = clearance - 0.5 * math.hypot(home.x - end_x, home.y - end_y)
+            if clearance > 0 and score > best_score:
+                best, best_score = path[-1], score
+        return best if best is not None else (home.x, home.y)
+
+
+POLICIES: Final[dict[str, type[PlayerPolicy]]] = {
+    "greedy": GreedyHomePolicy,
+    "field": PotentialFieldPolicy,
+    "lookahead": LookaheadPolicy,
+}
+
+
+class EpisodeResult(NamedTuple):
+    """
+    Outcome of one bot episode
+    """
+    result: str
+    steps: int
+    seconds: float
+
+
+def run_episodes(policy: PlayerPolicy,
+                 level: int,
+                 episodes: int,
+                 max_steps: int,
+                 seed: int = 0,
+                 record: Callable[[TurtleAdventureGame], None] | None = None,
+                 world_size: tuple[int, int] | None = None
+                 ) -> list[EpisodeResult]:
+    """
+    Let a policy play a level for a number of episodes.  The window is never
+    shown and frames are stepped back to back instead of waiting for the
+    update delay, so the episodes run as fast as the engine can go.  Enemies
+    spawn on the game's steps rather than on the wall clock, so an episode
+    sees the same enemies however fast it runs and a seed replays it.  When
+    given, record is called with the game after every step, and world_size
+    makes the world larger than the window.
+    """
+    root = tk.Tk()
+    root.withdraw()
+    world_width, world_height = world_size or (SCREEN_WIDTH, SCREEN_HEIGHT)
+    game = TurtleAdventureGame(root, SCREEN_WIDTH, SCREEN_HEIGHT, level=level,
+                               world_width=world_width, world_height=world_height)
+    game.policy = policy
+    initial = game.snapshot()
+    results = []
+    for episode in range(episodes):
+        game.stop()
+        game.restore(initial)
+        random.seed(seed + episode)
+        game.start(animate=False)
+        steps = 0
+        begin = time.perf_counter()
+        while game.is_started and steps < max_steps:
+            game.step()
+            # let the canvas redraw
+            root.update()
+            if record is not None:
+                record(game)
+            steps += 1
+        results.append(EpisodeResult(game.result or "timeout", steps,
+                                     time.perf_counter() - begin))
+    root.destroy()
+    return results
+
+
+def main() -> None:
+    """
+    Parse the command line, run the episodes and report the throughput
+    """
+    parser = argparse.ArgumentParser(description="Run Turtle's Adventure bots")
+    parser.add_argument("--policy", choices=POLICIES, default="field")
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--episodes", type=int, default=10)
+    parser.add_argument("--max-steps", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--world-width", type=int, default=SCREEN_WIDTH)
+    parser.add_argument("--world-height", type=int, default=SCREEN_HEIGHT)
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--record", metavar="FILE",
+                        help="write every frame to a raw rgb24 video file (needs NumPy)")
+    output.add_argument("--png-dir", metavar="DIR",
+                        help="write every frame as a PNG file in DIR (needs NumPy)")
+    args = parser.parse_args()
+
+    record = None
+    writer = None
+    if args.record or args.png_dir:
+        # pylint: disable=import-outside-toplevel
+        from raster import Scene, FrameRenderer, RawVideoWriter, PngSequenceWriter
+        renderer = FrameRenderer(SCREEN_WIDTH, SCREEN_HEIGHT)
+        writer = RawVideoWriter(args.record) if args.record else PngSequenceWriter(args.png_dir)
+
+        def record_frame(game: TurtleAdventureGame) -> None:
+            writer.write(renderer.render(Scene.of(game)))
+        record = record_frame
+    try:
+        results = run_episodes(POLICIES[args.policy](), args.level, args.episodes,
+                               args.max_steps, args.seed, record,
+                               (args.world_width, args.world_height))
+    finally:
+        if writer is not None:
+            writer.close()
+    for i, (result, steps, seconds) in enumerate(results):
+        print(f"episode {i:3}: {result:<8}{steps:6} steps {steps / seconds:9.1f} steps/s")
+    steps = sum(r.steps for r in results)
+    seconds = sum(r.seconds for r in results)
+    wins = sum(r.result == "win" for r in results)
+    print(f"total: {wins}/{len(results)} won, {steps} steps, {steps / seconds:.1f} steps/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 The gamelib module defines abstract classes necessary for implementing simple
 games based on tkinter's canvas.
 """
+import time
 import tkinter as tk
 from abc import ABC, abstractmethod
 
@@ -92,6 +93,11 @@ class Game(tk.Frame, ABC): # pylint: disable=too-many-ancestors
         self.__game_elements = []
         self.__update_delay = update_delay
         self.__started = False
+        self.__animate_id = None
+        self.__frame_time = 0.0
+        self.__frame_count = 0
+        self.__tick_count = 0
+        self.__frame_times: list[float] | None = None
         self.init_game()
 
     @abstractmethod
@@ -126,6 +132,13 @@ class Game(tk.Frame, ABC): # pylint: disable=too-many-ancestors
         element.delete()
         self.__game_elements.remove(element)
 
+    @property
+    def elements(self) -> list[GameElement]:
+        """
+        Get a copy of the game elements in their update order
+        """
+        return list(self.__game_elements)
+
     @property
     def canvas(self) -> tk.Canvas:
         """
@@ -140,26 +153,95 @@ class Game(tk.Frame, ABC): # pylint: disable=too-many-ancestors
         """
         return self.__started
 
-    def start(self) -> None:
+    @property
+    def update_delay(self) -> int:
+        """
+        Get the delay in milliseconds between two frames, which is also the
+        time budget for updating and rendering a frame
+        """
+        return self.__update_delay
+
+    @property
+    def frame_time(self) -> float:
+        """
+        Get the smoothed time in milliseconds spent updating and rendering
+        one frame
+        """
+        return self.__frame_time
+
+    @property
+    def frame_count(self) -> int:
+        """
+        Get the number of frames animated so far
         """
-        Start the game
+        return self.__frame_count
+
+    @property
+    def tick_count(self) -> int:
+        """
+        Get the number of times all elements have been updated so far, both
+        by animated frames and by direct calls to step()
+        """
+        return self.__tick_count
+
+    def track_frame_times(self) -> None:
+        """
+        Start keeping the time taken by every step, to be collected with
+        take_frame_times().  Nothing is kept until this is called, and once
+        it is, the caller is expected to collect the times regularly.
+        """
+        if self.__frame_times is None:
+            self.__frame_times = []
+
+    def take_frame_times(self) -> list[float]:
+        """
+        Give the times in milliseconds taken by each step since the last
+        call, or an empty list if frame times are not tracked
+        """
+        if self.__frame_times is None:
+            return []
+        frame_times, self.__frame_times = self.__frame_times, []
+        return frame_times
+
+    def start(self, animate: bool = True) -> None:
+        """
+        Start the game.  With animate set to False, no frames are scheduled
+        and the caller is expected to drive the game by calling step().
         """
         if not self.__started:
             self.__started = True
-            self.animate()
+            if animate:
+                self.animate()
 
     def stop(self) -> None:
         """
         Stop the game
         """
         self.__started = False
+        if self.__animate_id is not None:
+            self.after_cancel(self.__animate_id)
+            self.__animate_id = None
 
     def animate(self):
         """
-        Update and render all game's elements
+        Update and render all game's elements, then schedule the next frame
         """
+        self.step()
+        self.__frame_count += 1
+        if self.__started:
+            self.__animate_id = self.after(self.__update_delay, self.animate)
+
+    def step(self) -> None:
+        """
+        Update and render all game's elements once
+        """
+        begin = time.perf_counter()
         for element in self.__game_elements:
             element.update()
             element.render()
-        if self.__started:
-            self.after(self.__update_delay, self.animate)
+        elapsed = (time.perf_counter() - begin) * 1000
+        # moving average, so that a single slow frame does not count as load
+        self.__frame_time += (elapsed - self.__frame_time) * 0.1
+        self.__tick_count += 1
+        if self.__frame_times is not None:
+            self.__frame_times.append(elapsed)
@@ -3,18 +3,75 @@ The main module, responsible for creating a root window containing the game's
 main component.
 """
 from typing import Final
+import argparse
+import sys
+import time
 import tkinter as tk
-from turtle_adventure import TurtleAdventureGame
 
 SCREEN_WIDTH: Final = 800
 SCREEN_HEIGHT: Final = 500
 
-if __name__ == "__main__":
+
+def report_startup(phases: list[tuple[str, float]]) -> None:
+    """
+    Print the duration of each startup phase, given as (name, end time)
+    pairs following a ("start", time) pair
+    """
+    for (_, begin), (name, end) in zip(phases, phases[1:]):
+        print(f"{name:<16}{(end - begin) * 1000:8.1f} ms", file=sys.stderr)
+    print(f"{'time to frame':<16}{(phases[-1][1] - phases[0][1]) * 1000:8.1f} ms",
+          file=sys.stderr)
+
+
+def main() -> None:
+    """
+    Parse the command line, then create and run the game
+    """
+    parser = argparse.ArgumentParser(description="Turtle's Adventure")
+    parser.add_argument("--level", type=int, default=1,
+                        help="game level (levels with boss: 6, 30, 40)")
+    parser.add_argument("--world-width", type=int, default=SCREEN_WIDTH,
+                        help="width of the world, which scrolls if wider than the window")
+    parser.add_argument("--world-height", type=int, default=SCREEN_HEIGHT,
+                        help="height of the world, which scrolls if taller than the window")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="report how long each phase takes until the first frame")
+    parser.add_argument("--telemetry-jsonl", metavar="FILE",
+                        help="append per-second game metrics to a JSONL file")
+    parser.add_argument("--telemetry-port", type=int, metavar="PORT",
+                        help="serve per-second game metrics at http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--telemetry-tcl-calls", action="store_true",
+                        help="also count the Tcl commands issued through the canvas, "
+                             "at some cost per command")
+    args = parser.parse_args()
+
+    phases = [("start", time.perf_counter())]
+    # pylint: disable=import-outside-toplevel
+    from turtle_adventure import TurtleAdventureGame
+    phases.append(("import game", time.perf_counter()))
     root = tk.Tk()
     root.title("Turtle's Adventure")
     root.geometry(f"{SCREEN_WIDTH}x{SCREEN_HEIGHT}")
     root.resizable(False, False) # games usually have fixed window size
-    # Level with boss: 6, 30, 40
-    game = TurtleAdventureGame(root, SCREEN_WIDTH, SCREEN_HEIGHT, level=1)
+    phases.append(("create window", time.perf_counter()))
+    game = TurtleAdventureGame(root, SCREEN_WIDTH, SCREEN_HEIGHT, level=args.level,
+                               world_width=args.world_width, world_height=args.world_height)
+    phases.append(("create game", time.perf_counter()))
+    if args.telemetry_jsonl or args.telemetry_port is not None:
+        from telemetry import Telemetry
+        Telemetry(game, args.telemetry_jsonl, args.telemetry_port,
+                  count_tcl_calls=args.telemetry_tcl_calls)
     game.start()
+    phases.append(("first update", time.perf_counter()))
+    if args.profile_startup:
+        def first_frame():
+            root.update_idletasks()
+            phases.append(("first frame", time.perf_counter()))
+            report_startup(phases)
+        # idle callbacks run in order, so this one follows the first redraw
+        root.after_idle(first_frame)
     root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+The raster module draws frames of the Turtle's Adventure game into a NumPy
+RGB buffer, without going through the Tk canvas, and streams them to raw
+video or PNG files.  NumPy is only needed when this module is used.
+
+Frames are drawn from a Scene, a plain copy of what is on screen, so that
+drawing them needs neither Tk nor a display; only taking a Scene from a
+running game does.
+"""
+from typing import TYPE_CHECKING, NamedTuple
+import os
+import struct
+import zlib
+import math
+import numpy as np
+
+if TYPE_CHECKING:
+    from turtle_adventure import TurtleAdventureGame
+
+# RGB values of the Tk color names used by the game
+COLORS: dict[str, tuple[int, int, int]] = {
+    "white": (255, 255, 255),
+    "black": (0, 0, 0),
+    "red": (255, 0, 0),
+    "green": (0, 128, 0),
+    "blue": (0, 0, 255),
+    "brown": (165, 42, 42),
+}
+
+
+def parse_color(color: str) -> tuple[int, int, int]:
+    """
+    Convert a color name or a "#rrggbb" string into an RGB tuple
+    """
+    if color.startswith("#") and len(color) == 7:
+        return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+    return COLORS[color.lower()]
+
+
+class Scene(NamedTuple):
+    """
+    What a frame shows, in world coordinates: the camera's top-left corner,
+    home's center and size, the waypoint, the player's location and heading,
+    and an (x, y, size, color) tuple for every enemy that may be on screen
+    """
+    camera: tuple[float, float]
+    home: tuple[float, float, float]
+    waypoint: tuple[float, float] | None
+    player: tuple[float, float, float]
+    enemies: list[tuple[float, float, float, str]]
+
+    @classmethod
+    def of(cls, game: "TurtleAdventureGame") -> "Scene":
+        """
+        Take the scene currently shown by a game.  Only the enemies in the
+        chunks around the camera are copied, so the cost does not grow with
+        the size of the world.
+        """
+        waypoint = game.waypoint
+        return cls((game.camera.x, game.camera.y),
+                   (game.home.x, game.home.y, game.home.size),
+                   (waypoint.x, waypoint.y) if waypoint.is_active else None,
+                   (game.player.x, game.player.y, game.player.heading),
+                   [(enemy.x, enemy.y, enemy.size, enemy.color)
+                    for enemy in game.enemy_systems.active()])
+
+
+class FrameRenderer:
+    """
+    Render the game's home, waypoint, player and enemies into one RGB buffer
+    that is reused for every frame.  Each shape only touches the pixels of
+    its own bounding box.
+    """
+
+    def __init__(self, width: int, height: int, background: str = "white"):
+        self.__width: int = width
+        self.__height: int = height
+        self.__background = np.array(parse_color(background), dtype=np.uint8)
+        self.__frame = np.empty((height, width, 3), dtype=np.uint8)
+        # pixel centers, sliced to a shape's bounding box when drawing
+        self.__xs = np.arange(width, dtype=np.float32)[np.newaxis, :]
+        self.__ys = np.arange(height, dtype=np.float32)[:, np.newaxis]
+        self.__colors: dict[str, np.ndarray] = {}
+
+    @property
+    def frame(self) -> np.ndarray:
+        """
+        Get the height x width x 3 buffer holding the last rendered frame
+        """
+        return self.__frame
+
+    def color(self, name: str) -> np.ndarray:
+        """
+        Give the RGB array of a color name
+        """
+        if name not in self.__colors:
+            self.__colors[name] = np.array(parse_color(name), dtype=np.uint8)
+        return self.__colors[name]
+
+    def box(self, x1: float, y1: float, x2: float, y2: float):
+        """
+        Give the slices of the buffer covering a bounding box, or None if the
+        box lies outside the frame
+        """
+        left, top = max(0, math.floor(x1)), max(0, math.floor(y1))
+        right = min(self.__width, math.ceil(x2) + 1)
+        bottom = min(self.__height, math.ceil(y2) + 1)
+        if left >= right or top >= bottom:
+            return None
+        return slice(top, bottom), slice(left, right)
+
+    def fill_circle(self, x: float, y: float, radius: float, color: str) -> None:
+        """
+        Fill a circle centered at (x, y) with a one pixel black outline, as
+        the canvas draws enemy ovals
+        """
+        box = self.box(x - radius, y - radius, x + radius, y + radius)
+        if box is None:
+            return
+        rows, cols = box
+        d2 = (self.__xs[:, cols] - x)**2 + (self.__ys[rows] - y)**2
+        region = self.__frame[rows, cols]
+        region[d2 <= radius**2] = self.color("black")
+        region[d2 <= (radius - 1)**2] = self.color(color)
+
+    def draw_line(self,
+                  x1: float, y1: float,
+                  x2: float, y2: float,
+                  width: float,
+                  color: str) -> None:
+        """
+        Draw a line segment of the given width
+        """
+        half = width / 2
+        box = self.box(min(x1, x2) - half, min(y1, y2) - half,
+                       max(x1, x2) + half, max(y1, y2) + half)
+        if box is None:
+            return
+        rows, cols = box
+        xs, ys = self.__xs[:, cols], self.__ys[rows]
+        dx, dy = x2 - x1, y2 - y1
+        length2 = dx*dx + dy*dy or 1
+        t = np.clip(((xs - x1)*dx + (ys - y1)*dy) / length2, 0, 1)
+        d2 = (xs - x1 - t*dx)**2 + (ys - y1 - t*dy)**2
+        self.__frame[rows, cols][d2 <= half**2] = self.color(color)
+
+    def fill_polygon(self, points: list[tuple[float, float]], color: str) -> None:
+        """
+        Fill a convex polygon
+        """
+        box = self.box(min(p[0] for p in points), min(p[1] for p in points),
+                       max(p[0] for p in points), max(p[1] for p in points))
+        if box is None:
+            return
+        rows, cols = box
+        xs, ys = self.__xs[:, cols], self.__ys[rows]
+        # a point is inside when it lies on the same side of every edge
+        sides = [(bx - ax)*(ys - ay) - (by - ay)*(xs - ax)
+                 for (ax, ay), (bx, by) in zip(points, points[1:] + points[:1])]
+        inside = np.logical_or(np.all([s >= 0 for s in sides], axis=0),
+                               np.all([s <= 0 for s in sides], axis=0))
+        self.__frame[rows, cols][inside] = self.color(color)
+
+    def render(self, scene: Scene) -> np.ndarray:
+        """
+        Draw the part of the world seen by the scene's camera and return the
+        frame buffer
+        """
+        self.__frame[...] = self.__background
+        # shift world coordinates into the frame
+        left, top = scene.camera
+        home_x, home_y, size = scene.home
+        x1, y1 = home_x - size/2 - left, home_y - size/2 - top
+        x2, y2 = home_x + size/2 - left, home_y + size/2 - top
+        for ax, ay, bx, by in ((x1, y1, x2, y1), (x2, y1, x2, y2),
+                               (x2, y2, x1, y2), (x1, y2, x1, y1)):
+            self.draw_line(ax, ay, bx, by, 2, "brown")
+        for x, y, size, color in scene.enemies:
+            self.fill_circle(x - left, y - top, size/2, color)
+        if scene.waypoint is not None:
+            x, y = scene.waypoint[0] - left, scene.waypoint[1] - top
+            self.draw_line(x-10, y-10, x+10, y+10, 2, "green")
+            self.draw_line(x-10, y+10, x+10, y-10, 2, "green")
+        # the turtle is drawn as an arrowhead pointing along its heading
+        x, y, heading = scene.player
+        x, y = x - left, y - top
+        angle = math.radians(heading)
+        cos, sin = math.cos(angle), math.sin(angle)
+        self.fill_polygon([(x + 10*cos, y + 10*sin),
+                           (x - 8*cos - 7*sin, y - 8*sin + 7*cos),
+                           (x - 8*cos + 7*sin, y - 8*sin - 7*cos)],
+                          "green")
+        return self.__frame
+
+
+class RawVideoWriter:
+    """
+    Append frames to a headerless rgb24 video file, which can be converted
+    with, e.g., ffmpeg -f rawvideo -pixel_format rgb24 -video_size WxH -i FILE
+    """
+
+    def __init__(self, path: str):
+        self.__file = open(path, "wb") # pylint: disable=consider-using-with
+
+    def write(self, frame: np.ndarray) -> None:
+        """
+        Append a frame to the video
+        """
+        frame.tofile(self.__file)
+
+    def close(self) -> None:
+        """
+        Close the video file
+        """
+        self.__file.close()
+
+    def __enter__(self) -> "RawVideoWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class PngSequenceWriter:
+    """
+    Write frames to numbered PNG files in a directory
+    """
+
+    def __init__(self, directory: str, prefix: str = "frame", compression: int = 1):
+        os.makedirs(directory, exist_ok=True)
+        self.__directory: str = directory
+        self.__prefix: str = prefix
+        self.__compression: int = compression
+        self.__count: int = 0
+        self.__rows: np.ndarray | None = None
+
+    @staticmethod
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        """
+        Wrap data into a PNG chunk
+        """
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data)))
+
+    def write(self, frame: np.ndarray) -> None:
+        """
+        Write a frame into the next file of the sequence
+        """
+        height, width, _ = frame.shape
+        if self.__rows is None or self.__rows.shape != (height, width*3 + 1):
+            # every row starts with filter type 0 (none)
+            self.__rows = np.zeros((height, width*3 + 1), dtype=np.uint8)
+        self.__rows[:, 1:] = frame.reshape(height, width*3)
+        header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+        path = os.path.join(self.__directory, f"{self.__prefix}{self.__count:06}.png")
+        with open(path, "wb") as file:
+            file.write(b"\x89PNG\r\n\x1a\n")
+            file.write(self.chunk(b"IHDR", header))
+            file.write(self.chunk(b"IDAT", zlib.compress(self.__rows.tobytes(),
+                                                         self.__compression)))
+            file.write(self.chunk(b"IEND", b""))
+        self.__count += 1
+
+    def close(self) -> None:
+        """
+        Finish the sequence; nothing is kept open between frames
+        """
+
+    def __enter__(self) -> "PngSequenceWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,186 @@
+"""
+The telemetry module publishes per-second health metrics of a running
+Turtle's Adventure game, either as an append-only JSONL file or as a local
+Prometheus-style text endpoint.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import queue
+import threading
+import time
+from turtle_adventure import TurtleAdventureGame
+
+
+class CountingTcl:
+    """
+    Stand in for a widget's Tcl interpreter, counting the commands issued
+    through it and delegating everything else.  Only the widgets whose tk
+    attribute is replaced by it are counted.
+    """
+
+    def __init__(self, tcl):
+        self.__tcl = tcl
+        self.calls: int = 0
+
+    def call(self, *args):
+        """
+        Run a Tcl command and count it
+        """
+        self.calls += 1
+        return self.__tcl.call(*args)
+
+    def __getattr__(self, name):
+        return getattr(self.__tcl, name)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """
+    Give the nearest-rank percentile of sorted values, or 0 if there is none
+    """
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class Telemetry:
+    """
+    Sample a game's counters once per interval on the Tk thread, and leave
+    sorting the frame times and serializing the metrics to a background
+    thread.  The Tk thread only reads counters and queues the raw numbers.
+
+    With count_tcl_calls, every canvas command goes through a Python-level
+    counter, which costs time on every call, so it is off by default.  The
+    count covers the commands issued through the game's canvas, i.e., all
+    item creation, coords and itemconfigure calls and the turtle's drawing,
+    but not the timers, event processing and window updates of the game's
+    frame and root window.
+    """
+
+    def __init__(self,
+                 game: TurtleAdventureGame,
+                 jsonl_path: str | None = None,
+                 port: int | None = None,
+                 interval: int = 1000,
+                 count_tcl_calls: bool = False):
+        self.__game: TurtleAdventureGame = game
+        self.__interval: int = interval
+        self.__jsonl_path: str | None = jsonl_path
+        self.__samples: queue.SimpleQueue = queue.SimpleQueue()
+        self.__metrics: str = ""
+        self.__tcl: CountingTcl | None = None
+        if count_tcl_calls:
+            # canvas methods, including the turtle's, go through canvas.tk;
+            # the frame and the root window keep their own reference to the
+            # interpreter and are not counted
+            self.__tcl = CountingTcl(game.canvas.tk)
+            game.canvas.tk = self.__tcl
+        game.track_frame_times()
+        self.__last = self.__counters()
+        self.__last_time = time.monotonic()
+        threading.Thread(target=self.__publish, daemon=True).start()
+        if port is not None:
+            self.__server = ThreadingHTTPServer(("127.0.0.1", port), self.__handler())
+            threading.Thread(target=self.__server.serve_forever, daemon=True).start()
+        game.after(interval, self.sample)
+
+    @property
+    def metrics(self) -> str:
+        """
+        Get the latest metrics in Prometheus text format
+        """
+        return self.__metrics
+
+    def __counters(self) -> tuple[int, int, int, int, int]:
+        game = self.__game
+        tcl_calls = self.__tcl.calls if self.__tcl is not None else 0
+        return (game.frame_count, game.tick_count, game.spawn_count,
+                game.despawn_count, tcl_calls)
+
+    def sample(self) -> None:
+        """
+        Queue the raw numbers of the interval that just ended and schedule
+        the next sample
+        """
+        game = self.__game
+        now = time.monotonic()
+        counters = self.__counters()
+        live = {
+            "enemies": len(game.enemies),
+            "fencing_enemies": len(game.fencing_enemies),
+            "boss_enemies": len(game.boss_enemies),
+            "bullets": len(game.bullets),
+        }
+        self.__samples.put((time.time(), now - self.__last_time,
+                            [c - l for c, l in zip(counters, self.__last)],
+                            live, game.take_frame_times()))
+        self.__last, self.__last_time = counters, now
+        game.after(self.__interval, self.sample)
+
+    def __publish(self) -> None:
+        while True:
+            timestamp, seconds, deltas, live, frame_times = self.__samples.get()
+            frame_times.sort()
+            frames, ticks, spawns, despawns, tcl_calls = deltas
+            record = {
+                "time": timestamp,
+                "seconds": seconds,
+                "frames": frames,
+                "ticks": ticks,
+                "spawns": spawns,
+                "despawns": despawns,
+                "tcl_calls": tcl_calls if self.__tcl is not None else None,
+                "live": live,
+                "frame_time_p50_ms": percentile(frame_times, 0.5),
+                "frame_time_p99_ms": percentile(frame_times, 0.99),
+            }
+            self.__metrics = self.format_metrics(record)
+            if self.__jsonl_path is not None:
+                with open(self.__jsonl_path, "a", encoding="utf-8") as file:
+                    file.write(json.dumps(record) + "\n")
+
+    @staticmethod
+    def format_metrics(record: dict) -> str:
+        """
+        Render a metrics record in Prometheus text format
+        """
+        seconds = record["seconds"] or 1
+        lines = []
+        for name in ("frames", "ticks", "spawns", "despawns", "tcl_calls"):
+            if record[name] is None:
+                continue
+            lines.append(f"# TYPE turtle_{name}_per_second gauge")
+            lines.append(f"turtle_{name}_per_second {record[name] / seconds:.3f}")
+        lines.append("# TYPE turtle_live_enemies gauge")
+        for kind, count in record["live"].items():
+            lines.append(f'turtle_live_enemies{{kind="{kind}"}} {count}')
+        lines.append("# TYPE turtle_frame_time_ms gauge")
+        lines.append(f'turtle_frame_time_ms{{quantile="0.5"}} {record["frame_time_p50_ms"]:.3f}')
+        lines.append(f'turtle_frame_time_ms{{quantile="0.99"}} {record["frame_time_p99_ms"]:.3f}')
+        return "\n".join(lines) + "\n"
+
+    def __handler(self) -> type[BaseHTTPRequestHandler]:
+        telemetry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            """
+            Serve the latest metrics at /metrics
+            """
+
+            def do_GET(self): # pylint: disable=invalid-name
+                """
+                Answer a GET request
+                """
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = telemetry.metrics.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args): # pylint: disable=redefined-builtin
+                pass
+
+        return MetricsHandler
@@ -2,11 +2,22 @@
 The turtle_adventure module maintains all classes related to the Turtle's
 adventure game.
 """
-from turtle import RawTurtle
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Callable
 from gamelib import Game, GameElement
 from math import floor
+import bisect
+import itertools
 import math
 import random
+import struct
+import time
+
+if TYPE_CHECKING:
+    # turtle is only imported once the player's sprite is created, so
+    # importing this module does not pay for it, although creating a game
+    # still does before its first frame
+    from turtle import RawTurtle
 
 
 
@@ -143,15 +154,24 @@ class Player(TurtleGameElement):
 
     def __init__(self,
                  game: "TurtleAdventureGame",
-                 turtle: RawTurtle,
                  speed: float = 5):
         super().__init__(game)
         self.__speed: float = speed
-        self.__turtle: RawTurtle = turtle
+        self.__turtle: "RawTurtle"
 
     def create(self) -> None:
+        from turtle import RawTurtle # pylint: disable=import-outside-toplevel
         turtle = RawTurtle(self.canvas)
-        turtle.getscreen().tracer(False) # disable turtle's built-in animation
+        screen = turtle.getscreen()
+        screen.tracer(False) # disable turtle's built-in animation
+        # set turtle screen's origin to the top-left corner, one unit per
+        # pixel, so that turtle coordinates are canvas coordinates anywhere
+        # in a world larger than the window; the transform is set directly
+        # because setworldcoordinates() also resets the screen and rescales
+        # every canvas item
+        # pylint: disable=protected-access
+        screen._mode = "world"
+        screen.xscale, screen.yscale = 1.0, -1.0
         turtle.shape("turtle")
         turtle.color("green")
         turtle.penup()
@@ -178,6 +198,10 @@ class Player(TurtleGameElement):
             self.game.game_over_win()
         turtle = self.__turtle
         waypoint = self.game.waypoint
+        if self.game.policy is not None:
+            target = self.game.policy.choose_waypoint(self.game)
+            if target is not None:
+                waypoint.activate(*target)
         if self.game.waypoint.is_active:
             turtle.setheading(turtle.towards(waypoint.x, waypoint.y))
             turtle.forward(self.speed)
@@ -188,6 +212,17 @@ class Player(TurtleGameElement):
         self.__turtle.goto(self.x, self.y)
         self.__turtle.getscreen().update()
 
+    @property
+    def heading(self) -> float:
+        """
+        Get or set the direction the player is facing, in degrees
+        """
+        return self.__turtle.heading()
+
+    @heading.setter
+    def heading(self, val: float) -> None:
+        self.__turtle.setheading(val)
+
     # override original property x's getter/setter to use turtle's methods
     # instead
     @property
@@ -209,20 +244,510 @@ class Player(TurtleGameElement):
         self.__turtle.sety(val)
 
 
+class Camera(TurtleGameElement):
+    """
+    Represent the part of the world shown in the window, kept centered on the
+    player as far as the edges of the world allow.  The camera's x and y are
+    the world coordinates of the window's top-left corner.
+    """
+
+    def __init__(self, game: "TurtleAdventureGame"):
+        super().__init__(game)
+        self.__shown: tuple[float, float] | None = None
+
+    def create(self) -> None:
+        # canvas coordinates are world coordinates; the camera scrolls
+        self.canvas.config(scrollregion=(0, 0, self.game.world_width, self.game.world_height))
+
+    def delete(self) -> None:
+        pass
+
+    def update(self) -> None:
+        game = self.game
+        self.x = max(0, min(game.player.x - game.screen_width/2,
+                            game.world_width - game.screen_width))
+        self.y = max(0, min(game.player.y - game.screen_height/2,
+                            game.world_height - game.screen_height))
+
+    def render(self) -> None:
+        if (self.x, self.y) != self.__shown:
+            self.canvas.xview_moveto(self.x / self.game.world_width)
+            self.canvas.yview_moveto(self.y / self.game.world_height)
+            self.__shown = (self.x, self.y)
+
+
+class SpawnSampler:
+    """
+    Draw spawn locations on the border of the game area.
+
+    The border is walked clockwise from the top-left corner and treated as a
+    single parameter t in [0, perimeter), so a location costs one random
+    number.  Circles around the player and home are cut out of that range
+    before drawing, so a location never has to be rejected and drawn again.
+    """
+
+    def __init__(self,
+                 game: "TurtleAdventureGame",
+                 width: float,
+                 height: float,
+                 player_radius: float = 150,
+                 home_radius: float = 100):
+        self.__game: "TurtleAdventureGame" = game
+        self.player_radius: float = player_radius
+        self.home_radius: float = home_radius
+        # (start t, start x, start y, direction x, direction y, length)
+        self.__edges: list[tuple[float, float, float, float, float, float]] = [
+            (0, 0, 0, 1, 0, width),
+            (width, width, 0, 0, 1, height),
+            (width + height, width, height, -1, 0, width),
+            (2*width + height, 0, height, 0, -1, height),
+        ]
+        self.__edge_starts: list[float] = [edge[0] for edge in self.__edges]
+        self.__perimeter: float = 2 * (width + height)
+        self.__pending: list[tuple[float, float]] = []
+
+    @property
+    def game(self) -> "TurtleAdventureGame":
+        """
+        Get reference to the associated TurtleAdventureGame instance
+        """
+        return self.__game
+
+    @property
+    def perimeter(self) -> float:
+        """
+        Get the length of the border on which enemies spawn
+        """
+        return self.__perimeter
+
+    def point_at(self, t: float) -> tuple[float, float]:
+        """
+        Map a border parameter t to its (x, y) location.
+        """
+        edge = self.__edges[bisect.bisect_right(self.__edge_starts, t) - 1]
+        start, x, y, dx, dy, _ = edge
+        return x + dx*(t - start), y + dy*(t - start)
+
+    def excluded_ranges(self, cx: float, cy: float, radius: float) -> list[tuple[float, float]]:
+        """
+        Give the border parameter ranges lying within radius of (cx, cy).
+        """
+        ranges = []
+        for start, x, y, dx, dy, length in self.__edges:
+            # solve |(x, y) + s*(dx, dy) - (cx, cy)| <= radius for s
+            b = dx*(x - cx) + dy*(y - cy)
+            c = (x - cx)**2 + (y - cy)**2 - radius**2
+            disc = b*b - c
+            if disc <= 0:
+                continue
+            root = math.sqrt(disc)
+            lo, hi = max(-b - root, 0), min(-b + root, length)
+            if lo < hi:
+                ranges.append((start + lo, start + hi))
+        return ranges
+
+    def allowed_ranges(self) -> list[tuple[float, float]]:
+        """
+        Give the border parameter ranges currently allowed for spawning,
+        i.e., the whole border minus the areas around the player and home.
+        """
+        player, home = self.game.player, self.game.home
+        excluded = sorted(self.excluded_ranges(player.x, player.y, self.player_radius)
+                          + self.excluded_ranges(home.x, home.y, self.home_radius))
+        allowed = []
+        cursor = 0.0
+        for lo, hi in excluded:
+            if lo > cursor:
+                allowed.append((cursor, lo))
+            cursor = max(cursor, hi)
+        if cursor < self.__perimeter:
+            allowed.append((cursor, self.__perimeter))
+        # never leave enemies without a place to spawn
+        return allowed or [(0.0, self.__perimeter)]
+
+    def sample(self, count: int) -> list[tuple[float, float]]:
+        """
+        Draw count spawn locations at once, sharing one table of allowed
+        ranges between them.
+        """
+        allowed = self.allowed_ranges()
+        offsets = list(itertools.accumulate(hi - lo for lo, hi in allowed))
+        total = offsets[-1]
+        points = []
+        for _ in range(count):
+            u = random.random() * total
+            i = min(bisect.bisect_right(offsets, u), len(allowed) - 1)
+            lo, hi = allowed[i]
+            points.append(self.point_at(hi - (offsets[i] - u)))
+        return points
+
+    def reserve(self, count: int) -> None:
+        """
+        Draw locations for the next count spawns in a single batch.
+        """
+        self.__pending = self.sample(count)
+
+    def next(self) -> tuple[float, float]:
+        """
+        Give the location for the next spawn, taken from the reserved batch
+        when there is one.
+        """
+        if self.__pending:
+            return self.__pending.pop()
+        return self.sample(1)[0]
+
+
+class TrajectoryCache:
+    """
+    Ring buffer holding the future states of an enemy whose movement does not
+    depend on the player.  States are computed ahead in bulk whenever the
+    buffer runs dry, so advancing one frame is only an index bump.
+    """
+
+    def __init__(self, step: Callable[[tuple], tuple], state: tuple, size: int = 64):
+        self.__step = step
+        self.__size: int = size
+        self.__buffer: list[tuple] = [state] * size
+        self.__head: int = 0
+        self.__count: int = 1
+
+    def reset(self, state: tuple) -> None:
+        """
+        Drop all computed states and continue from the given one
+        """
+        self.__buffer[0] = state
+        self.__head = 0
+        self.__count = 1
+
+    def fill(self) -> None:
+        """
+        Compute states until the buffer is full
+        """
+        step, buffer, size = self.__step, self.__buffer, self.__size
+        state = buffer[(self.__head + self.__count - 1) % size]
+        for i in range(self.__head + self.__count, self.__head + size):
+            state = step(state)
+            buffer[i % size] = state
+        self.__count = size
+
+    def advance(self) -> tuple:
+        """
+        Move on to the next state and return it
+        """
+        if self.__count < 2:
+            self.fill()
+        self.__head = (self.__head + 1) % self.__size
+        self.__count -= 1
+        return self.__buffer[self.__head]
+
+    def peek(self, steps: int) -> list[tuple]:
+        """
+        Give the states of the next steps frames without advancing; steps
+        must be smaller than the buffer size
+        """
+        if self.__count <= steps:
+            self.fill()
+        return [self.__buffer[(self.__head + i) % self.__size] for i in range(1, steps + 1)]
+
+
+class Steering(ABC):
+    """
+    An abstract steering behavior, the component deciding how an enemy moves.
+    A behavior sets the enemy's velocity, which the movement system then adds
+    to its position.
+    """
+
+    def start(self, enemy: "Enemy") -> None:
+        """
+        Get called once the enemy has been placed at its spawn location
+        """
+
+    @abstractmethod
+    def steer(self, enemy: "Enemy") -> None:
+        """
+        Set the enemy's velocity for the current frame
+        """
+
+    def travel(self, enemy: "Enemy", frames: int) -> tuple[float, float]:
+        """
+        Give how far the enemy moves over the given number of frames, for
+        enemies that are only simulated every few frames.  By default, the
+        enemy is steered once and keeps its velocity for all the frames.
+        """
+        self.steer(enemy)
+        return enemy.vx * frames, enemy.vy * frames
+
+    def get_state(self) -> tuple[float, ...]:
+        """
+        Give the state of this behavior to be stored in a game snapshot
+        """
+        return ()
+
+    def set_state(self, enemy: "Enemy", state: tuple[float, ...]) -> None:
+        """
+        Restore the state given by get_state()
+        """
+
+
+class Seek(Steering):
+    """
+    Walk straight towards the player
+    """
+
+    def steer(self, enemy: "Enemy") -> None:
+        player = enemy.game.player
+        dx, dy = player.x - enemy.x, player.y - enemy.y
+        distance = math.sqrt(dx**2 + dy**2)
+        enemy.vx = enemy.speed * dx / distance
+        enemy.vy = enemy.speed * dy / distance
+
+
+class Wander(Steering):
+    """
+    Walk towards a random point of the screen, then pick another one
+    """
+
+    def __init__(self):
+        self.__to_x: float = 0
+        self.__to_y: float = 0
+
+    def start(self, enemy: "Enemy") -> None:
+        self.__to_x = random.randrange(0, enemy.game.world_width)
+        self.__to_y = random.randrange(0, enemy.game.world_height)
+
+    def steer(self, enemy: "Enemy") -> None:
+        cell = enemy.speed * 5
+        if (floor(enemy.x/cell) == floor(self.__to_x/cell)
+                and floor(enemy.y/cell) == floor(self.__to_y/cell)):
+            self.start(enemy)
+        dx, dy = self.__to_x - enemy.x, self.__to_y - enemy.y
+        distance = math.sqrt(dx**2 + dy**2)
+        enemy.vx = enemy.speed * dx / distance
+        enemy.vy = enemy.speed * dy / distance
+
+    def get_state(self) -> tuple[float, ...]:
+        return (self.__to_x, self.__to_y)
+
+    def set_state(self, enemy: "Enemy", state: tuple[float, ...]) -> None:
+        self.__to_x, self.__to_y = state
+
+
+class Patrol(Steering):
+    """
+    Walk around home along the corners of a square.  The path only depends on
+    where the enemy spawns, so it is precomputed with a TrajectoryCache unless
+    cache_size is 0.
+    """
+
+    def __init__(self,
+                 home: Home,
+                 side: float,
+                 reverse: bool = False,
+                 cache_size: int = 64):
+        s = side/2
+        h_x, h_y = home.x, home.y
+        self.__sides = [[h_x+s, h_y+s],[h_x+s, h_y-s],[h_x-s, h_y-s],[h_x-s, h_y+s]]
+        self.__reverse: bool = reverse
+        self.__index: int = 0
+        self.__speed: float = 0
+        self.__cache_size: int = cache_size
+        self.__cache: TrajectoryCache | None = None
+
+    def start(self, enemy: "Enemy") -> None:
+        self.__speed = enemy.speed
+        if self.__cache_size:
+            self.__cache = TrajectoryCache(self.step, (enemy.x, enemy.y, self.__index),
+                                           self.__cache_size)
+
+    def step(self, state: tuple) -> tuple:
+        """
+        Compute the (x, y, corner index) state following the given one
+        """
+        x, y, index = state
+        speed = self.__speed
+        to_x, to_y = self.__sides[index]
+        distance = math.sqrt((to_x-x)**2 + (to_y-y)**2)
+        x += speed * (to_x-x) / distance
+        y += speed * (to_y-y) / distance
+        if floor(x/speed/5) == floor(to_x/speed/5) and floor(y/speed/5) == floor(to_y/speed/5):
+            index = self.next_index(index)
+        return x, y, index
+
+    def next_index(self, index: int) -> int:
+        """
+        Give the corner to walk to after the given one
+        """
+        if self.__reverse:
+            return 3 if index == 0 else index - 1
+        return 0 if index == 3 else index + 1
+
+    def __advance(self, x: float, y: float) -> tuple[float, float]:
+        if self.__cache is not None:
+            x, y, self.__index = self.__cache.advance()
+        else:
+            x, y, self.__index = self.step((x, y, self.__index))
+        return x, y
+
+    def steer(self, enemy: "Enemy") -> None:
+        x, y = self.__advance(enemy.x, enemy.y)
+        enemy.vx = x - enemy.x
+        enemy.vy = y - enemy.y
+
+    def travel(self, enemy: "Enemy", frames: int) -> tuple[float, float]:
+        # follow the path around the corners frame by frame
+        x, y = enemy.x, enemy.y
+        for _ in range(frames):
+            x, y = self.__advance(x, y)
+        enemy.vx, enemy.vy = (x - enemy.x) / frames, (y - enemy.y) / frames
+        return x - enemy.x, y - enemy.y
+
+    def predict(self, enemy: "Enemy", steps: int) -> list[tuple[float, float]]:
+        """
+        Give the positions of the enemy over the next steps frames
+        """
+        if self.__cache is not None and steps < self.__cache_size:
+            return [(x, y) for x, y, _ in self.__cache.peek(steps)]
+        state = (enemy.x, enemy.y, self.__index)
+        positions = []
+        for _ in range(steps):
+            state = self.step(state)
+            positions.append(state[:2])
+        return positions
+
+    def get_state(self) -> tuple[float, ...]:
+        return (self.__index, self.__reverse, *itertools.chain(*self.__sides))
+
+    def set_state(self, enemy: "Enemy", state: tuple[float, ...]) -> None:
+        self.__index = int(state[0])
+        self.__reverse = bool(state[1])
+        corners = state[2:]
+        self.__sides = [[corners[i], corners[i+1]] for i in range(0, 8, 2)]
+        self.__speed = enemy.speed
+        if self.__cache is not None:
+            self.__cache.reset((enemy.x, enemy.y, self.__index))
+
+
+class Homing(Steering):
+    """
+    Accelerate towards the player, keeping the velocity between frames
+    """
+
+    def __init__(self, acceleration: float):
+        self.__acceleration: float = acceleration
+
+    def steer(self, enemy: "Enemy") -> None:
+        player = enemy.game.player
+        dx, dy = player.x - enemy.x, player.y - enemy.y
+        distance = math.sqrt(dx**2 + dy**2)
+        enemy.vx += self.__acceleration * dx / distance
+        enemy.vy += self.__acceleration * dy / distance
+
+    def travel(self, enemy: "Enemy", frames: int) -> tuple[float, float]:
+        # the velocity keeps growing, so it is accelerated frame by frame
+        dx = dy = 0.0
+        for _ in range(frames):
+            self.steer(enemy)
+            dx += enemy.vx
+            dy += enemy.vy
+        return dx, dy
+
+    def get_state(self) -> tuple[float, ...]:
+        return (self.__acceleration,)
+
+    def set_state(self, enemy: "Enemy", state: tuple[float, ...]) -> None:
+        (self.__acceleration,) = state
+
+
+class Shooter:
+    """
+    Component firing bullets at the player from the enemy's location, capped
+    at bullet_cap live bullets while frames run over budget
+    """
+
+    def __init__(self, bullet_cap: int = 15):
+        self.bullet_cap: int = bullet_cap
+
+    def can_fire(self, enemy: "Enemy") -> bool:
+        """
+        Check whether the enemy may fire another bullet.  Bullets are only
+        capped when frames take longer than the game's update delay.
+        """
+        game = enemy.game
+        if game.load <= 1:
+            return True
+        live = sum(1 for bullet in game.bullets if bullet.owner is enemy)
+        return live < self.bullet_cap
+
+    def fire(self, enemy: "Enemy") -> None:
+        """
+        Possibly fire a bullet during the current frame
+        """
+        if random.randint(0,1) == 1 and self.can_fire(enemy):
+            enemy.game.add_enemy(Bullet(enemy.game, 10, 'black', enemy.x, enemy.y, 2,
+                                        owner=enemy))
+
+
+class Sprite:
+    """
+    Component drawing an enemy as a filled oval on the canvas
+    """
+
+    def __init__(self, color: str):
+        self.__color: str = color
+        self.__id: int = 0
+
+    @property
+    def id(self) -> int:
+        """
+        Get the id of the canvas item
+        """
+        return self.__id
+
+    def create(self, canvas) -> None:
+        """
+        Create the canvas item
+        """
+        self.__id = canvas.create_oval(0, 0, 0, 0, fill=self.__color)
+
+    def delete(self, canvas) -> None:
+        """
+        Delete the canvas item
+        """
+        canvas.delete(self.__id)
+
+
 class Enemy(TurtleGameElement):
     """
-    Define an abstract enemy for the Turtle's adventure game
+    Define an abstract enemy for the Turtle's adventure game.  An enemy is a
+    composition of components: its position and velocity, a steering
+    behavior, a square collider of the enemy's size, a sprite and optionally
+    a shooter.  The systems in EnemySystems process the components of all
+    enemies in bulk.
     """
 
+    # whether the enemy is removed once it leaves the screen
+    LEAVES_SCREEN: bool = False
+
     def __init__(self,
                  game: "TurtleAdventureGame",
                  size: int,
                  color: str,
-                 speed: float):
+                 speed: float,
+                 steering: Steering,
+                 shooter: Shooter | None = None,
+                 pos: tuple[float, float] | None = None):
         super().__init__(game)
         self.__size = size
         self.__color = color
         self.__speed = speed
+        self.__pos = pos
+        self.vx: float = 0
+        self.vy: float = 0
+        self.chunk: tuple[int, int] | None = None
+        self.phase: int = 0
+        self.steering: Steering = steering
+        self.shooter: Shooter | None = shooter
+        self.sprite: Sprite = Sprite(color)
 
     @property
     def size(self) -> float:
@@ -251,23 +776,54 @@ class Enemy(TurtleGameElement):
     def speed(self, new_speed: float):
         self.__speed = new_speed
         
-    def hits_player(self):
+    def generate_spawn_loca(self):
+        return self.game.spawn_sampler.next()
+
+    def create(self) -> None:
+        pos = self.__pos if self.__pos is not None else self.generate_spawn_loca()
+        self.sprite.create(self.canvas)
+        self.x = pos[0]
+        self.y = pos[1]
+        self.steering.start(self)
+
+    def update(self) -> None:
+        # steering, movement, shooting and collision are run for all enemies
+        # at once by EnemySystems.update()
+        pass
+
+    def render(self) -> None:
+        # sprites are placed for all visible enemies at once by
+        # EnemySystems.render()
+        pass
+
+    def delete(self) -> None:
+        self.sprite.delete(self.canvas)
+
+    def get_state(self) -> tuple[float, ...]:
         """
-        Check whether the enemy is hitting the player
+        Give the velocity and steering state of the enemy to be stored in a
+        game snapshot
         """
-        return (
-            (self.x - self.size/2 < self.game.player.x < self.x + self.size/2)
-            and
-            (self.y - self.size/2 < self.game.player.y < self.y + self.size/2)
-        )
-        
-    def generate_spawn_loca(self):
-        x = random.choice((0,self.game.canvas.winfo_width()))
-        y = random.choice((0,self.game.canvas.winfo_height()))
-        range_x = [(x,x+1), (0, self.game.canvas.winfo_width())]
-        range_y = [(y,y+1), (0, self.game.canvas.winfo_height())]
-        choose_index = random.randint(0,1)
-        return random.randrange(*range_x[choose_index]), random.randrange(*range_y[1-choose_index])
+        return (self.vx, self.vy, *self.steering.get_state())
+
+    def set_state(self, state: tuple[float, ...]) -> None:
+        """
+        Restore the state given by get_state()
+        """
+        self.vx, self.vy = state[:2]
+        self.steering.set_state(self, state[2:])
+
+    @classmethod
+    def from_state(cls,
+                   game: "TurtleAdventureGame",
+                   size: int,
+                   color: str,
+                   speed: float) -> "Enemy":
+        """
+        Construct an enemy of this kind to be filled in from a game snapshot.
+        Every kind builds its own components, so every kind overrides this.
+        """
+        raise NotImplementedError
 
 
 # TODO
@@ -278,7 +834,7 @@ class Enemy(TurtleGameElement):
 #   self.game.game_over_lose() method in the TurtleAdventureGame class.
 class DemoEnemy(Enemy):
     """
-    Demo enemy
+    Demo enemy, wandering around the screen
     """
 
     def __init__(self,
@@ -286,35 +842,17 @@ class DemoEnemy(Enemy):
                  size: int,
                  color: str = "green", 
                  speed: float = 1):
-        super().__init__(game, size, color, speed)
-        self.__to_x = random.randrange(0, self.game.canvas.winfo_width())
-        self.__to_y = random.randrange(0, self.game.canvas.winfo_height())
-
-    def create(self) -> None:
-        pos = self.generate_spawn_loca()
-        self.__id = self.canvas.create_oval(0,0,0,0,fill=self.color)
-        self.x = pos[0]
-        self.y = pos[1]
-        self.render()
+        super().__init__(game, size, color, speed, Wander())
 
-    def update(self) -> None:
-        distance = math.sqrt((self.__to_x-self.x)**2 + (self.__to_y-self.y)**2)
-        self.x += self.speed * (self.__to_x-self.x) / distance
-        self.y += self.speed * (self.__to_y-self.y) / distance
-        if floor(self.x/self.speed/5) == floor(self.__to_x/self.speed/5) and floor(self.y/self.speed/5) == floor(self.__to_y/self.speed/5):
-            self.__to_x = random.randrange(0, self.game.canvas.winfo_width())
-            self.__to_y = random.randrange(0, self.game.canvas.winfo_height())
-        if self.hits_player():
-            self.game.game_over_lose()
-            
+    @classmethod
+    def from_state(cls,
+                   game: "TurtleAdventureGame",
+                   size: int,
+                   color: str,
+                   speed: float) -> "Enemy":
+        return cls(game, size, color, speed)
 
-    def render(self) -> None:
-        self.canvas.coords(self.__id, self.x-self.size/2, self.y -
-                            self.size/2, self.x+self.size/2, self.y+self.size/2)
 
-    def delete(self) -> None:
-        self.canvas.delete(self.__id)
-        
 class ChasingEnemy(Enemy):
     """
     Chasing enemy
@@ -325,35 +863,25 @@ class ChasingEnemy(Enemy):
                  size: int,
                  color: str, 
                  speed: float = 1):
-        super().__init__(game, size, color, speed)
+        super().__init__(game, size, color, speed, Seek())
 
-    def create(self) -> None:
-        pos = self.generate_spawn_loca()
-        self.__id = self.canvas.create_oval(0,0,0,0,fill=self.color)
-        self.x = pos[0]
-        self.y = pos[1]
-        self.render()
-
-    def update(self) -> None:
-        distance = math.sqrt((self.game.player.x-self.x)**2 + (self.game.player.y-self.y)**2)
-        self.x += self.speed * (self.game.player.x-self.x) / distance
-        self.y += self.speed * (self.game.player.y-self.y) / distance
-        if self.hits_player():
-            self.game.game_over_lose()
-            
-
-    def render(self) -> None:
-        self.canvas.coords(self.__id, self.x-self.size/2, self.y -
-                            self.size/2, self.x+self.size/2, self.y+self.size/2)
+    @classmethod
+    def from_state(cls,
+                   game: "TurtleAdventureGame",
+                   size: int,
+                   color: str,
+                   speed: float) -> "Enemy":
+        return cls(game, size, color, speed)
 
-    def delete(self) -> None:
-        self.canvas.delete(self.__id)
 
 class FencingEnemy(Enemy):
     """
-    Chasing enemy
+    Fencing enemy, walking around home.  Its path is precomputed unless
+    TRAJECTORY_CACHE_SIZE is set to 0.
     """
 
+    TRAJECTORY_CACHE_SIZE: int = 64
+
     def __init__(self,
                  game: "TurtleAdventureGame",
                  size: int,
@@ -361,152 +889,90 @@ class FencingEnemy(Enemy):
                  speed: float = 1,
                  side: float = 300,
                  reverse: bool = False):
-        super().__init__(game, size, color, speed)
-        self.__index = 0
-        self.__to = []
-        s = side/2
-        h_x = self.game.home.x
-        h_y = self.game.home.y
-        self.__sides = [[h_x+s, h_y+s],[h_x+s, h_y-s],[h_x-s, h_y-s],[h_x-s, h_y+s]]
-        self.__reverse = reverse
-
-    def create(self) -> None:
-        pos = self.generate_spawn_loca()
-        self.__id = self.canvas.create_oval(0,0,0,0,fill=self.color)
-        self.x = pos[0]
-        self.y = pos[1]
-        self.render()
+        super().__init__(game, size, color, speed,
+                         Patrol(game.home, side, reverse, self.TRAJECTORY_CACHE_SIZE))
 
-    def update(self) -> None:
-        x = self.__sides[self.__index][0]
-        y = self.__sides[self.__index][1]
-        distance = math.sqrt((x-self.x)**2 + (y-self.y)**2)
-        self.x += self.speed * (x-self.x) / distance
-        self.y += self.speed * (y-self.y) / distance
-        if floor(self.x/self.speed/5) == floor(x/self.speed/5) and floor(self.y/self.speed/5) == floor(y/self.speed/5):
-            self.switch_place()
-        if self.hits_player():
-            self.game.game_over_lose()
-        
+    @classmethod
+    def from_state(cls,
+                   game: "TurtleAdventureGame",
+                   size: int,
+                   color: str,
+                   speed: float) -> "Enemy":
+        # the patrol's corners and direction are restored from the snapshot
+        return cls(game, size, color, speed)
+
+    def predict(self, steps: int) -> list[tuple[float, float]]:
+        """
+        Give the positions of this enemy over the next steps frames
+        """
+        return self.steering.predict(self, steps)
 
-    def render(self) -> None:
-        self.canvas.coords(self.__id, self.x-self.size/2, self.y -
-                            self.size/2, self.x+self.size/2, self.y+self.size/2)
 
-    def delete(self) -> None:
-        self.canvas.delete(self.__id)
-        
-    def switch_place(self):
-        if self.__reverse:
-            self.__index -= 1
-            if self.__index < 0:
-                self.__index = 3
-        else:
-            self.__index += 1
-            if self.__index > 3:
-                self.__index = 0
-        
 class BossEnemy(Enemy):
     """
-    Boss enemy
+    Boss enemy, chasing the player while firing bullets
     """
+
+    # most bullets a boss keeps alive while frames run over budget
+    BULLET_CAP: int = 15
+
     def __init__(self,
                  game: "TurtleAdventureGame",
                  size: int,
                  color: str, 
                  speed: float = 1):
-        super().__init__(game, size, color, speed)
-
-    def create(self) -> None:
-        pos = self.generate_spawn_loca()
-        self.__id = self.canvas.create_oval(0,0,0,0,fill=self.color)
-        self.x = pos[0]
-        self.y = pos[1]
-        self.render()
+        super().__init__(game, size, color, speed, Seek(), Shooter(self.BULLET_CAP))
 
-    @property
-    def id(self):
-        return self.__id
-
-    def update(self) -> None:
-        distance = math.sqrt((self.game.player.x-self.x)**2 + (self.game.player.y-self.y)**2)
-        self.x += self.speed * (self.game.player.x-self.x) / distance
-        self.y += self.speed * (self.game.player.y-self.y) / distance
-        if random.randint(0,1) == 1:
-            new_enemy = Bullet(self.game, 10, 'black', self.x, self.y, 2)
-            self.game.add_enemy(new_enemy)
-            
-        if self.hits_player():
-            self.game.game_over_lose()
-            
+    @classmethod
+    def from_state(cls,
+                   game: "TurtleAdventureGame",
+                   size: int,
+                   color: str,
+                   speed: float) -> "Enemy":
+        return cls(game, size, color, speed)
 
-    def render(self) -> None:
-        self.canvas.coords(self.__id, self.x-self.size/2, self.y -
-                            self.size/2, self.x+self.size/2, self.y+self.size/2)
 
-    def delete(self) -> None:
-        self.canvas.delete(self.__id)
-        
 class Bullet(Enemy):
     """
-    Chasing enemy
+    Bullet fired by a boss, accelerating towards the player
     """
+
+    LEAVES_SCREEN: bool = True
+
     def __init__(self,
                  game: "TurtleAdventureGame",
                  size: int,
                  color: str, 
                  x:int,
                  y:int,
-                 speed: float = 1,):
-        super().__init__(game, size, color, speed)
-        self.__speedx = 0
-        self.__speedy = 0
-        self.__acceleration = speed * 0.1
-        self.__x = x
-        self.__y = y
-    
+                 speed: float = 1,
+                 owner: BossEnemy | None = None):
+        super().__init__(game, size, color, speed, Homing(speed * 0.1), pos=(x, y))
+        self.__owner = owner
+
     @property
-    def id(self):
-        return self.__id
-    
-    def create(self) -> None:
-        pos = [self.__x, self.__y]
-        self.__id = self.canvas.create_oval(0,0,0,0,fill=self.color)
-        self.x = pos[0]
-        self.y = pos[1]
-        self.render()
+    def owner(self) -> BossEnemy | None:
+        """
+        Get the boss that fired this bullet, if known
+        """
+        return self.__owner
 
-    def update(self) -> None:
-        distance = math.sqrt((self.game.player.x-self.x)**2 + (self.game.player.y-self.y)**2)
-        self.__speedx += self.__acceleration * (self.game.player.x-self.x) / distance
-        self.__speedy += self.__acceleration * (self.game.player.y-self.y) / distance
-        # if abs(self.__speedx) > self.speed:
-        #     self.__speedx = self.__speedx / abs(self.__speedx) * 2
-        # if abs(self.__speedy) > self.speed:
-        #     self.__speedy = self.__speedy / abs(self.__speedy) * 2
-        self.x += self.__speedx
-        self.y += self.__speedy
-        if self.hits_player():
-            self.game.game_over_lose()
-        if self.x < 0 or self.x > self.game.winfo_width():
-            self.game.bullets.pop(0)
-            self.game.delete_element(self)
-            return 
-        if self.y < 0 or self.y > self.game.winfo_height():
-            self.game.bullets.pop(0)
-            self.game.delete_element(self)
-            return
+    @owner.setter
+    def owner(self, val: BossEnemy | None) -> None:
+        self.__owner = val
+
+    @classmethod
+    def from_state(cls,
+                   game: "TurtleAdventureGame",
+                   size: int,
+                   color: str,
+                   speed: float) -> "Enemy":
+        return cls(game, size, color, 0, 0, speed)
 
-    def render(self) -> None:
-        self.canvas.coords(self.__id, self.x-self.size/2, self.y -
-                            self.size/2, self.x+self.size/2, self.y+self.size/2)
 
-    def delete(self) -> None:
-        self.canvas.delete(self.__id)
-        
 class OhioLastBossEnemy(Enemy):
     """
-    Chasing enemy
+    Last boss enemy, chasing the player
     """
 
     def __init__(self,
@@ -514,30 +980,250 @@ class OhioLastBossEnemy(Enemy):
                  size: int,
                  color: str, 
                  speed: float = 1):
-        super().__init__(game, size, color, speed)
+        super().__init__(game, size, color, speed, Seek())
+
+    @classmethod
+    def from_state(cls,
+                   game: "TurtleAdventureGame",
+                   size: int,
+                   color: str,
+                   speed: float) -> "Enemy":
+        return cls(game, size, color, speed)
+
+
+class EnemySystems(TurtleGameElement):
+    """
+    Game element running the enemy systems over all enemies in bulk: steering,
+    movement, shooting, collision, despawning and sprite rendering.  Keeping
+    each system in one loop means an optimization only has to be made once.
+
+    Enemies are also kept in square chunks of the world.  Chunks around the
+    camera are simulated on every frame and rendered, while enemies in the
+    rest of the world are only simulated every FAR_TICK_INTERVAL frames and
+    never rendered.  Enemies are dealt round-robin into FAR_TICK_INTERVAL
+    phases and each frame simulates the far enemies of one phase, so every
+    frame does the same share of the far work.  A far enemy advances by
+    FAR_TICK_INTERVAL frames' worth of movement and shooting when it is
+    simulated, so it keeps its speed and rate of fire.
+    """
+
+    CHUNK_SIZE: int = 256
+    FAR_TICK_INTERVAL: int = 4
+
+    def __init__(self, game: "TurtleAdventureGame"):
+        super().__init__(game)
+        self.__entities: list[Enemy] = []
+        # dicts are used as insertion-ordered sets
+        self.__chunks: dict[tuple[int, int], dict[Enemy, None]] = {}
+        self.__shown: dict[Enemy, None] = {}
+        self.__phases: list[dict[Enemy, None]] = [{} for _ in range(self.FAR_TICK_INTERVAL)]
+        self.__next_phase: int = 0
+        self.__ticks: int = 0
+
+    @property
+    def entities(self) -> list[Enemy]:
+        """
+        Get the enemies in the order they are processed
+        """
+        return self.__entities
+
+    def chunk_of(self, x: float, y: float) -> tuple[int, int]:
+        """
+        Give the key of the chunk containing the point (x, y)
+        """
+        return int(x // self.CHUNK_SIZE), int(y // self.CHUNK_SIZE)
+
+    def near_chunks(self,
+                    x1: float, y1: float,
+                    x2: float, y2: float) -> list[tuple[int, int]]:
+        """
+        Give the keys of the chunks overlapping a rectangle, widened by one
+        chunk on every side
+        """
+        cx1, cy1 = self.chunk_of(x1, y1)
+        cx2, cy2 = self.chunk_of(x2, y2)
+        return [(cx, cy) for cx in range(cx1 - 1, cx2 + 2) for cy in range(cy1 - 1, cy2 + 2)]
+
+    def in_chunks(self, keys: list[tuple[int, int]]) -> list[Enemy]:
+        """
+        Give the enemies in the given chunks
+        """
+        chunks = self.__chunks
+        return [enemy for key in keys if key in chunks for enemy in chunks[key]]
+
+    def camera_chunks(self) -> list[tuple[int, int]]:
+        """
+        Give the keys of the chunks around the camera
+        """
+        camera = self.game.camera
+        return self.near_chunks(camera.x, camera.y,
+                                camera.x + self.game.screen_width,
+                                camera.y + self.game.screen_height)
+
+    def active(self) -> list[Enemy]:
+        """
+        Give the enemies in the chunks around the camera
+        """
+        return self.in_chunks(self.camera_chunks())
+
+    def __place(self, enemy: Enemy) -> None:
+        key = self.chunk_of(enemy.x, enemy.y)
+        if key != enemy.chunk:
+            if enemy.chunk is not None:
+                self.__unplace(enemy)
+            self.__chunks.setdefault(key, {})[enemy] = None
+            enemy.chunk = key
+
+    def __deal(self, enemy: Enemy) -> None:
+        enemy.phase = self.__next_phase
+        self.__phases[enemy.phase][enemy] = None
+        self.__next_phase = (self.__next_phase + 1) % self.FAR_TICK_INTERVAL
+
+    def __unplace(self, enemy: Enemy) -> None:
+        chunk = self.__chunks[enemy.chunk]
+        del chunk[enemy]
+        if not chunk:
+            del self.__chunks[enemy.chunk]
+        enemy.chunk = None
+
+    def add(self, enemy: Enemy) -> None:
+        """
+        Create an enemy and let the systems process it
+        """
+        enemy.create()
+        self.__entities.append(enemy)
+        self.__place(enemy)
+        self.__deal(enemy)
+        # render() shows it once it is near the camera
+        self.canvas.itemconfigure(enemy.sprite.id, state="hidden")
+
+    def remove(self, enemy: Enemy) -> None:
+        """
+        Delete an enemy and stop processing it
+        """
+        enemy.delete()
+        self.__entities.remove(enemy)
+        self.__unplace(enemy)
+        del self.__phases[enemy.phase][enemy]
+        self.__shown.pop(enemy, None)
+
+    @property
+    def tick(self) -> int:
+        """
+        Get or set which phase of far enemies the next frame follows, as the
+        number of frames modulo FAR_TICK_INTERVAL
+        """
+        return self.__ticks % self.FAR_TICK_INTERVAL
+
+    @tick.setter
+    def tick(self, val: int) -> None:
+        self.__ticks = val % self.FAR_TICK_INTERVAL
+
+    @property
+    def next_phase(self) -> int:
+        """
+        Get or set the phase the next added enemy is dealt into
+        """
+        return self.__next_phase
+
+    @next_phase.setter
+    def next_phase(self, val: int) -> None:
+        self.__next_phase = val % self.FAR_TICK_INTERVAL
+
+    def reorder(self, enemies: list[Enemy], phases: list[int] | None = None) -> None:
+        """
+        Change the processing order; the given list must contain exactly the
+        enemies already being processed.  Enemies may have been moved, so all
+        of them are placed in their chunks anew.  They are put into the given
+        phases, or dealt into phases anew, and the far enemies' frame count
+        starts over.
+        """
+        if sorted(map(id, enemies)) != sorted(map(id, self.__entities)):
+            raise ValueError("enemies do not match the processed enemies")
+        self.__entities[:] = enemies
+        self.__chunks.clear()
+        self.__shown.clear()
+        for phase in self.__phases:
+            phase.clear()
+        self.__next_phase = 0
+        self.__ticks = 0
+        for i, enemy in enumerate(enemies):
+            enemy.chunk = None
+            self.__place(enemy)
+            if phases is None:
+                self.__deal(enemy)
+            else:
+                enemy.phase = phases[i]
+                self.__phases[enemy.phase][enemy] = None
+            self.canvas.itemconfigure(enemy.sprite.id, state="hidden")
 
     def create(self) -> None:
-        pos = self.generate_spawn_loca()
-        self.__id = self.canvas.create_oval(0,0,0,0,fill=self.color)
-        self.x = pos[0]
-        self.y = pos[1]
-        self.render()
+        pass
+
+    def delete(self) -> None:
+        for enemy in self.__entities:
+            enemy.delete()
+        self.__entities.clear()
+        self.__chunks.clear()
+        self.__shown.clear()
+        for phase in self.__phases:
+            phase.clear()
 
     def update(self) -> None:
-        distance = math.sqrt((self.game.player.x-self.x)**2 + (self.game.player.y-self.y)**2)
-        self.x += self.speed * (self.game.player.x-self.x) / distance
-        self.y += self.speed * (self.game.player.y-self.y) / distance
-        if self.hits_player():
-            self.game.game_over_lose()
-            
+        self.__ticks += 1
+        keys = self.camera_chunks()
+        near = set(keys)
+        active = self.in_chunks(keys)
+        far = [enemy for enemy in self.__phases[self.__ticks % self.FAR_TICK_INTERVAL]
+               if enemy.chunk not in near]
+        frames = self.FAR_TICK_INTERVAL
+        for enemy in active:
+            enemy.steering.steer(enemy)
+        for enemy in active:
+            enemy.x += enemy.vx
+            enemy.y += enemy.vy
+            self.__place(enemy)
+        for enemy in far:
+            dx, dy = enemy.steering.travel(enemy, frames)
+            enemy.x += dx
+            enemy.y += dy
+            self.__place(enemy)
+        for enemy in active:
+            if enemy.shooter is not None:
+                enemy.shooter.fire(enemy)
+        for enemy in far:
+            if enemy.shooter is not None:
+                for _ in range(frames):
+                    enemy.shooter.fire(enemy)
+        # only enemies around the player can hit it, and the player's
+        # position is read once, not once per enemy
+        px, py = self.game.player.x, self.game.player.y
+        for enemy in self.in_chunks(self.near_chunks(px, py, px, py)):
+            half = enemy.size/2
+            if enemy.x - half < px < enemy.x + half and enemy.y - half < py < enemy.y + half:
+                self.game.game_over_lose()
+                break
+        width, height = self.game.world_width, self.game.world_height
+        for enemy in active + far:
+            if enemy.LEAVES_SCREEN and not (0 <= enemy.x <= width and 0 <= enemy.y <= height):
+                self.game.remove_enemy(enemy)
 
     def render(self) -> None:
-        self.canvas.coords(self.__id, self.x-self.size/2, self.y -
-                            self.size/2, self.x+self.size/2, self.y+self.size/2)
+        visible = self.active()
+        shown = dict.fromkeys(visible)
+        itemconfigure = self.canvas.itemconfigure
+        for enemy in self.__shown:
+            if enemy not in shown:
+                itemconfigure(enemy.sprite.id, state="hidden")
+        for enemy in visible:
+            if enemy not in self.__shown:
+                itemconfigure(enemy.sprite.id, state="normal")
+        self.__shown = shown
+        coords = self.canvas.coords
+        for enemy in visible:
+            half = enemy.size/2
+            coords(enemy.sprite.id, enemy.x-half, enemy.y-half, enemy.x+half, enemy.y+half)
 
-    def delete(self) -> None:
-        self.canvas.delete(self.__id)
-            
 
 # TODO
 # Complete the EnemyGenerator class by inserting code to generate enemies
@@ -550,18 +1236,31 @@ class OhioLastBossEnemy(Enemy):
 class EnemyGenerator:
     """
     An EnemyGenerator instance is responsible for creating enemies of various
-    kinds and scheduling them to appear at certain points in time.
+    kinds and scheduling them to appear at certain points in time.  While the
+    game is animated, time is the wall clock and spawns are run by Tk timers;
+    while the game is stepped by its caller, time is the number of steps
+    times the update delay and spawns are run by tick().
     """
 
+    # most spawn rounds held back while frames run over budget
+    MAX_DEFERRED: int = 3
+
     def __init__(self, game: "TurtleAdventureGame", level: int):
         self.__game: TurtleAdventureGame = game
         self.__level: int = level
         num = self.game.enemy_formula(self.__level)
         dtime = 2000 / num
 
+        self.__after_id: str = ""
+        self.__running: bool = False
+        self.__animated: bool = True
+        self.__remaining: int = 0
+        self.__due: float = 0
+        self.__deferred: int = 0
+
         # example
         deltatime = round((80/99)**self.__level*100)
-        self.__game.after(math.floor(dtime)+1, self.create_enemy)
+        self.schedule(math.floor(dtime)+1)
 
     @property
     def game(self) -> "TurtleAdventureGame":
@@ -577,29 +1276,147 @@ class EnemyGenerator:
         """
         return self.__level
 
+    def clock(self) -> float:
+        """
+        Give the current time in milliseconds
+        """
+        if self.__animated:
+            return time.monotonic() * 1000
+        return self.__game.tick_count * self.__game.update_delay
+
+    def start(self, animate: bool = True) -> None:
+        """
+        Start counting down to the next call of create_enemy(), on the wall
+        clock when animate is True, otherwise on the game's steps
+        """
+        self.__running = True
+        self.__animated = animate
+        self.schedule(self.__remaining)
+
+    def stop(self) -> None:
+        """
+        Pause the countdown to the next call of create_enemy()
+        """
+        self.__remaining = self.remaining_delay
+        self.__running = False
+        if self.__after_id:
+            self.__game.after_cancel(self.__after_id)
+            self.__after_id = ""
+
+    def schedule(self, delay: int) -> None:
+        """
+        Schedule the next call of create_enemy() after delay milliseconds,
+        replacing the one already scheduled
+        """
+        if self.__after_id:
+            self.__game.after_cancel(self.__after_id)
+            self.__after_id = ""
+        self.__remaining = delay
+        self.__due = self.clock() + delay
+        if self.__running and self.__animated:
+            self.__after_id = self.__game.after(delay, self.create_enemy)
+
+    def tick(self) -> None:
+        """
+        Call create_enemy() once it is due, when the game is stepped by its
+        caller
+        """
+        if self.__running and not self.__animated and self.clock() >= self.__due:
+            self.create_enemy()
+
+    @property
+    def deferred(self) -> int:
+        """
+        Get or set the number of spawn rounds currently held back
+        """
+        return self.__deferred
+
+    @deferred.setter
+    def deferred(self, val: int) -> None:
+        self.__deferred = val
+
+    @property
+    def remaining_delay(self) -> int:
+        """
+        Get the time in milliseconds until the next call of create_enemy()
+        """
+        if not self.__running:
+            return self.__remaining
+        return max(0, round(self.__due - self.clock()))
+
     def create_enemy(self) -> None:
         """
         Create a new enemy, possibly based on the game level
         """
         if not self.game.is_started:
             return
-        if len(self.game.enemies) <= self.game.enemy_formula(self.__level):  
-            choose = random.randint(0,1)
-            if choose == 1:
-                new_enemy = DemoEnemy(self.__game, 20, "red", 3)
-            else:
-                new_enemy = ChasingEnemy(self.__game, 20, "green", 3)
-            # new_enemy.x = 100
-            # new_enemy.y = 100
-            self.game.add_enemy(new_enemy)
-        if len(self.game.fencing_enemies) <= self.game.fencing_formula(self.__level):
-            new_enemy = FencingEnemy(self.__game, 20, "blue", 2, random.randint(100,200))
+        delay = self.game.delta_time_formula(self.__level)
+        load = self.game.load
+        if load > 1:
+            if self.__deferred < self.MAX_DEFERRED:
+                # frames are over budget: hold this round back and retry later
+                self.__deferred += 1
+                self.schedule(round(delay * load))
+                return
+            # still over budget with as many rounds held back as allowed:
+            # spawn a single round and keep the others held back
+            rounds = 1
+            delay = round(delay * load)
+        else:
+            rounds = 1 + self.__deferred
+            self.__deferred = 0
+        new_enemies = self.plan_enemies(rounds)
+        # draw the spawn locations of the whole burst at once
+        self.game.spawn_sampler.reserve(len(new_enemies))
+        for new_enemy in new_enemies:
             self.game.add_enemy(new_enemy)
-        if self.game.boss_formula(self.__level):
-            if len(self.game.boss_enemies) <= self.game.get_boss_amount(self.__level):
-                new_enemy = BossEnemy(self.__game, 20, "black", 2)
-                self.game.add_enemy(new_enemy)
-        self.__game.after(self.game.delta_time_formula(self.__level), self.create_enemy)
+        self.schedule(delay)
+
+    def plan_enemies(self, rounds: int) -> list[Enemy]:
+        """
+        Make the enemies of the given number of spawn rounds merged into one,
+        keeping the number of each kind within the level's limits.  Worlds
+        larger than the window get proportionally more roaming enemies, while
+        the fencing enemies and bosses around home and the player do not
+        change.
+        """
+        new_enemies: list[Enemy] = []
+        enemies = len(self.game.enemies)
+        fencing_enemies = len(self.game.fencing_enemies)
+        boss_enemies = len(self.game.boss_enemies)
+        enemy_limit = self.game.enemy_formula(self.__level) * self.game.area_scale
+        per_round = math.ceil(self.game.area_scale)
+        for _ in range(rounds):
+            for _ in range(per_round):
+                if enemies <= enemy_limit:
+                    choose = random.randint(0,1)
+                    if choose == 1:
+                        new_enemies.append(DemoEnemy(self.__game, 20, "red", 3))
+                    else:
+                        new_enemies.append(ChasingEnemy(self.__game, 20, "green", 3))
+                    enemies += 1
+            if fencing_enemies <= self.game.fencing_formula(self.__level):
+                new_enemies.append(FencingEnemy(self.__game, 20, "blue", 2, random.randint(100,200)))
+                fencing_enemies += 1
+            if self.game.boss_formula(self.__level):
+                if boss_enemies <= self.game.get_boss_amount(self.__level):
+                    new_enemies.append(BossEnemy(self.__game, 20, "black", 2))
+                    boss_enemies += 1
+        return new_enemies
+
+
+class PlayerPolicy(ABC):
+    """
+    An abstract class for scripted players that steer the player by setting
+    the waypoint on every tick, in place of the mouse
+    """
+
+    @abstractmethod
+    def choose_waypoint(self, game: "TurtleAdventureGame") -> tuple[float, float] | None:
+        """
+        Give the location the player should head to, or None to keep the
+        current waypoint
+        """
 
 
 class TurtleAdventureGame(Game): # pylint: disable=too-many-ancestors
@@ -607,11 +1424,33 @@ class TurtleAdventureGame(Game): # pylint: disable=too-many-ancestors
     The main class for Turtle's Adventure.
     """
 
+    # enemy kinds in the order of their codes in a snapshot
+    ENEMY_KINDS: tuple[type[Enemy], ...] = (DemoEnemy, ChasingEnemy, FencingEnemy,
+                                            BossEnemy, Bullet, OhioLastBossEnemy)
+    SNAPSHOT_MAGIC: bytes = b"TAS4"
+    # magic, level, player x/y/heading, waypoint active/x/y, generator delay
+    # and deferred rounds, far enemy tick and next phase
+    __STATE = struct.Struct("<4sHddd?ddIBBB")
+    __RANDOM_STATE = struct.Struct("<625Id")
+    # kind, size, speed, x, y, index of the owning boss or -1, phase, color
+    # length
+    __ENEMY = struct.Struct("<BHdddiBB")
+
     # pylint: disable=too-many-instance-attributes
-    def __init__(self, parent, screen_width: int, screen_height: int, level: int = 1):
+    def __init__(self,
+                 parent,
+                 screen_width: int,
+                 screen_height: int,
+                 level: int = 1,
+                 update_delay: int = 20,
+                 world_width: int | None = None,
+                 world_height: int | None = None):
         self.level: int = level
         self.screen_width: int = screen_width
         self.screen_height: int = screen_height
+        self.world_width: int = world_width or screen_width
+        self.world_height: int = world_height or screen_height
+        self.camera: Camera
         self.waypoint: Waypoint
         self.player: Player
         self.home: Home
@@ -619,70 +1458,251 @@ class TurtleAdventureGame(Game): # pylint: disable=too-many-ancestors
         self.fencing_enemies: list[Enemy] = []
         self.boss_enemies: list[BossEnemy] = []
         self.bullets: list[Bullet] = []
+        self.enemy_systems: EnemySystems
+        self.spawn_sampler: SpawnSampler
         self.enemy_generator: EnemyGenerator
-        super().__init__(parent, 20)
+        self.policy: PlayerPolicy | None = None
+        self.result: str | None = None
+        self.spawn_count: int = 0
+        self.despawn_count: int = 0
+        self.__message_id: int | None = None
+        self.__animated: bool = True
+        self.__initial_snapshot: bytes
+        super().__init__(parent, update_delay)
 
     def init_game(self):
         self.canvas.config(width=self.screen_width, height=self.screen_height)
-        turtle = RawTurtle(self.canvas)
-        # set turtle screen's origin to the top-left corner
-        turtle.screen.setworldcoordinates(0, self.screen_height-1, self.screen_width-1, 0)
 
         self.waypoint = Waypoint(self)
         self.add_element(self.waypoint)
-        self.home = Home(self, (self.screen_width-100, self.screen_height//2), 20)
+        self.home = Home(self, (self.world_width-100, self.world_height//2), 20)
         self.add_element(self.home)
-        self.player = Player(self, turtle)
+        self.player = Player(self)
         self.add_element(self.player)
-        self.canvas.bind("<Button-1>", lambda e: self.waypoint.activate(e.x, e.y))
-
+        self.camera = Camera(self)
+        self.add_element(self.camera)
+        self.enemy_systems = EnemySystems(self)
+        self.add_element(self.enemy_systems)
+        # clicks are in window coordinates, the waypoint in world coordinates
+        self.canvas.bind("<Button-1>", lambda e: self.waypoint.activate(
+            self.canvas.canvasx(e.x), self.canvas.canvasy(e.y)))
+
+        self.spawn_sampler = SpawnSampler(self, self.world_width, self.world_height)
         self.enemy_generator = EnemyGenerator(self, level=self.level)
 
         self.player.x = 50
-        self.player.y = self.screen_height//2
+        self.player.y = self.world_height//2
+        self.__initial_snapshot = self.snapshot()
+        self.winfo_toplevel().bind("<KeyPress-r>", lambda e: self.restart())
         
 
+    def enemy_list(self, enemy: Enemy) -> list:
+        """
+        Give the list keeping track of enemies of the given enemy's kind
+        """
+        if isinstance(enemy, FencingEnemy):
+            return self.fencing_enemies
+        if isinstance(enemy, BossEnemy):
+            return self.boss_enemies
+        if isinstance(enemy, Bullet):
+            return self.bullets
+        return self.enemies
+
     def add_enemy(self, enemy: Enemy) -> None:
         """
         Add a new enemy into the current game
         """
-        if isinstance(enemy, FencingEnemy):
-            self.fencing_enemies.append(enemy)
-            self.add_element(enemy)
-        elif isinstance(enemy, BossEnemy):
-            self.boss_enemies.append(enemy)
-            self.add_element(enemy)
-        elif isinstance(enemy, Bullet):
-            self.bullets.append(enemy)
-            self.add_element(enemy)
+        self.enemy_list(enemy).append(enemy)
+        self.enemy_systems.add(enemy)
+        self.spawn_count += 1
+
+    def remove_enemy(self, enemy: Enemy) -> None:
+        """
+        Remove an enemy from the current game
+        """
+        self.enemy_list(enemy).remove(enemy)
+        self.enemy_systems.remove(enemy)
+        self.despawn_count += 1
+
+    def snapshot(self) -> bytes:
+        """
+        Serialize the complete simulation state, including the random
+        generator, into a compact binary blob to be given to restore()
+        """
+        _, internal, gauss = random.getstate()
+        blob = [
+            self.__STATE.pack(self.SNAPSHOT_MAGIC, self.level,
+                              self.player.x, self.player.y, self.player.heading,
+                              self.waypoint.is_active, self.waypoint.x, self.waypoint.y,
+                              self.enemy_generator.remaining_delay,
+                              self.enemy_generator.deferred,
+                              self.enemy_systems.tick, self.enemy_systems.next_phase),
+            self.__RANDOM_STATE.pack(*internal, math.nan if gauss is None else gauss),
+        ]
+        enemies = self.enemy_systems.entities
+        index = {enemy: i for i, enemy in enumerate(enemies)}
+        blob.append(struct.pack("<I", len(enemies)))
+        for enemy in enemies:
+            color = enemy.color.encode()
+            state = enemy.get_state()
+            owner = index.get(enemy.owner, -1) if isinstance(enemy, Bullet) else -1
+            blob.append(self.__ENEMY.pack(self.ENEMY_KINDS.index(type(enemy)), enemy.size,
+                                          enemy.speed, enemy.x, enemy.y, owner, enemy.phase,
+                                          len(color)))
+            blob.append(color)
+            blob.append(struct.pack(f"<B{len(state)}d", len(state), *state))
+        return b"".join(blob)
+
+    def restore(self, blob: bytes) -> None:
+        """
+        Bring the game back to the state serialized by snapshot().  Existing
+        enemies and canvas items are reused wherever the kinds match.
+        """
+        (magic, level, player_x, player_y, heading,
+         active, waypoint_x, waypoint_y, delay, deferred,
+         tick, next_phase) = self.__STATE.unpack_from(blob)
+        if magic != self.SNAPSHOT_MAGIC or level != self.level:
+            raise ValueError("snapshot does not belong to this game")
+        offset = self.__STATE.size
+        *internal, gauss = self.__RANDOM_STATE.unpack_from(blob, offset)
+        offset += self.__RANDOM_STATE.size
+        (count,) = struct.unpack_from("<I", blob, offset)
+        offset += 4
+
+        # reuse enemies of the same kind, oldest first
+        spare: dict[tuple, list[Enemy]] = {}
+        for enemy in self.enemy_systems.entities:
+            spare.setdefault((type(enemy), enemy.size, enemy.color), []).append(enemy)
+        for enemies in (self.enemies, self.fencing_enemies, self.boss_enemies, self.bullets):
+            enemies.clear()
+        restored = []
+        owners = []
+        phases = []
+        for _ in range(count):
+            (kind, size, speed, x, y,
+             owner, phase, length) = self.__ENEMY.unpack_from(blob, offset)
+            offset += self.__ENEMY.size
+            color = bytes(blob[offset:offset+length]).decode()
+            offset += length
+            (fields,) = struct.unpack_from("<B", blob, offset)
+            state = struct.unpack_from(f"<{fields}d", blob, offset+1)
+            offset += 1 + 8*fields
+            kind = self.ENEMY_KINDS[kind]
+            if spare.get((kind, size, color)):
+                enemy = spare[(kind, size, color)].pop(0)
+            else:
+                # restored enemies are neither spawned nor despawned, so
+                # they bypass add_enemy() and remove_enemy() and their counts
+                enemy = kind.from_state(self, size, color, speed)
+                self.enemy_systems.add(enemy)
+            self.enemy_list(enemy).append(enemy)
+            enemy.speed = speed
+            enemy.x = x
+            enemy.y = y
+            enemy.set_state(state)
+            restored.append(enemy)
+            owners.append(owner)
+            phases.append(phase)
+        # bullets are linked to their bosses once all enemies exist, also
+        # replacing the owners of reused bullets
+        for enemy, owner in zip(restored, owners):
+            if isinstance(enemy, Bullet):
+                enemy.owner = restored[owner] if owner >= 0 else None
+        for enemies in spare.values():
+            for enemy in enemies:
+                self.enemy_systems.remove(enemy)
+        self.enemy_systems.reorder(restored, phases)
+        self.enemy_systems.tick = tick
+        self.enemy_systems.next_phase = next_phase
+
+        self.player.x = player_x
+        self.player.y = player_y
+        self.player.heading = heading
+        if active:
+            self.waypoint.activate(waypoint_x, waypoint_y)
         else:
-            self.enemies.append(enemy)
-            self.add_element(enemy)
+            self.waypoint.deactivate()
+            self.waypoint.x = waypoint_x
+            self.waypoint.y = waypoint_y
+        self.enemy_generator.schedule(delay)
+        self.enemy_generator.deferred = deferred
+        random.setstate((3, tuple(internal), None if math.isnan(gauss) else gauss))
+        self.result = None
+        if self.__message_id is not None:
+            self.canvas.itemconfigure(self.__message_id, state="hidden")
+        self.camera.update()
+        for element in self.elements:
+            element.render()
+
+    def start(self, animate: bool = True) -> None:
+        if not self.is_started:
+            self.__animated = animate
+            self.enemy_generator.start(animate)
+        super().start(animate)
+
+    def stop(self) -> None:
+        super().stop()
+        self.enemy_generator.stop()
+
+    def step(self) -> None:
+        super().step()
+        self.enemy_generator.tick()
+
+    def restart(self) -> None:
+        """
+        Restart the level from its initial state without rebuilding the game
+        """
+        self.stop()
+        self.restore(self.__initial_snapshot)
+        self.start()
+
+    def show_message(self, text: str, color: str) -> None:
+        """
+        Display a message in the middle of the window
+        """
+        if self.__message_id is None:
+            font = ("Arial", 36, "bold")
+            self.__message_id = self.canvas.create_text(0, 0, font=font)
+        self.canvas.coords(self.__message_id,
+                           self.camera.x + self.screen_width/2,
+                           self.camera.y + self.screen_height/2)
+        self.canvas.itemconfigure(self.__message_id, text=text, fill=color, state="normal")
+        self.canvas.tag_raise(self.__message_id)
 
     def game_over_win(self) -> None:
         """
         Called when the player wins the game and stop the game
         """
         self.stop()
-        font = ("Arial", 36, "bold")
-        self.canvas.create_text(self.screen_width/2,
-                                self.screen_height/2,
-                                text="You Win",
-                                font=font,
-                                fill="green")
+        self.result = "win"
+        self.show_message("You Win", "green")
 
     def game_over_lose(self) -> None:
         """
         Called when the player loses the game and stop the game
         """
         self.stop()
-        font = ("Arial", 36, "bold")
-        self.canvas.create_text(self.screen_width/2,
-                                self.screen_height/2,
-                                text="Skill Issue",
-                                font=font,
-                                fill="red")
+        self.result = "lose"
+        self.show_message("Skill Issue", "red")
                 
+    @property
+    def load(self) -> float:
+        """
+        Get the frame time as a fraction of the update delay.  A game stepped
+        by its caller has no time budget and always gives 0, so that it plays
+        the same way however fast it is stepped.
+        """
+        if not self.__animated:
+            return 0.0
+        return self.frame_time / self.update_delay
+
+    @property
+    def area_scale(self) -> float:
+        """
+        Get how many windows' worth of area the world covers
+        """
+        return (self.world_width * self.world_height) / (self.screen_width * self.screen_height)
+
     @classmethod
     def enemy_formula(cls, level:int):
         return 20 * math.log10(level + 1)